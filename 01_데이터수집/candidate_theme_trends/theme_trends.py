@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import os
+import random
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# 전역 설정
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STOCK_LIST_PATH = os.path.join(BASE_DIR, '..', '비정형데이터', 'stock_community', 'data', 'stock_list.csv')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+GEO = 'KR'
+MAX_KEYWORDS_PER_REQUEST = 5 # Google Trends 요청당 최대 키워드 수 (기준 키워드 포함)
+MAX_RETRIES = 5 # 요청 실패 시 최대 재시도 횟수
+BACKOFF_BASE = 10.0 # 재시도 대기 시간 (초) = BACKOFF_BASE * 2^시도횟수 + 랜덤
+REQUEST_DELAY = (2.5, 5.0) # 요청 간 랜덤 지연 시간 범위 (초)
+
+# 대선별 관심도 조회 기간
+ELECTION_TIMEFRAMES = {
+    '18대': '2012-04-23 2012-12-27',
+    '19대': '2017-03-10 2017-05-17',
+    '20대': '2021-07-12 2022-03-17',
+    '21대': '2025-04-04 2025-06-11',
+}
+
+# stock_list.csv에 없는 대선의 후보별 테마주 (candidate_theme_trends_2012/2017 노트북 기준)
+EXTRA_THEME_KEYWORDS = {
+    '18대': {
+        '박근혜': ["대유신소재", "대유에이텍", "EG", "보령메디앙스", "아가방컴퍼니"],
+        '문재인': ["씨씨에스", "우리들휴브레인", "우리들제약", "바른손", "모헨즈"],
+    },
+    '19대': {
+        '문재인': ["우리들휴브레인", "우리들제약", "에이텍", "바른손", "DSR"],
+        '홍준표': ["세우글로벌", "태양금속", "에스앤더블류", "딜리", "제이에스피브이"],
+        '안철수': ["안랩", "써니전자", "다믈멀티미디어", "포비스티앤씨", "오픈베이스"],
+    },
+}
+
+
+# --- 키워드 목록 ---
+def load_theme_keywords(file_path=STOCK_LIST_PATH):
+    """
+    stock_list.csv에서 {대선: {후보: [종목명, ...]}} 형태의 키워드 목록을 만듭니다.
+    stock_list.csv에 없는 대선은 EXTRA_THEME_KEYWORDS로 보충합니다.
+    """
+    theme_keywords = {election: {c: list(k) for c, k in candidates.items()} for election, candidates in EXTRA_THEME_KEYWORDS.items()}
+    if not os.path.exists(file_path):
+        print(f"경고: 종목 목록 파일이 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return theme_keywords
+
+    df = pd.read_csv(file_path, dtype=str, encoding='utf-8-sig')
+    for (election, candidate), group in df.groupby(['election', 'candidate'], sort=False):
+        theme_keywords.setdefault(election, {})[candidate] = group['stock_name'].drop_duplicates().tolist()
+    return theme_keywords
+
+
+def default_anchors(theme_keywords):
+    """대선별 기준 키워드(첫 번째 후보의 첫 번째 종목)를 {기간: 기준 키워드}로 반환합니다."""
+    anchors = {}
+    for election, timeframe in ELECTION_TIMEFRAMES.items():
+        candidates = theme_keywords.get(election)
+        if candidates:
+            anchors[timeframe] = next(iter(candidates.values()))[0]
+    return anchors
+
+
+def to_individual(df):
+    """키워드별 최댓값을 100으로 맞춘 절대 추이로 변환합니다."""
+    peak = df.max().replace(0, np.nan)
+    return (df / peak * 100).fillna(0)
+
+
+def to_relative(df):
+    """키워드 전체의 최댓값을 100으로 맞춘 상대 비교로 변환합니다."""
+    peak = df.values.max() if not df.empty else 0
+    return df / peak * 100 if peak > 0 else df
+
+
+# --- 관심도 제공자 ---
+class PytrendsProvider:
+    """pytrends(Google Trends) 기반 관심도 제공자."""
+
+    max_keywords = MAX_KEYWORDS_PER_REQUEST
+
+    def __init__(self, hl='ko', tz=540):
+        from pytrends.request import TrendReq
+        self.pytrends = TrendReq(hl=hl, tz=tz)
+
+    def interest_over_time(self, keywords, timeframe, geo=GEO):
+        """키워드 묶음의 관심도(요청 내 최댓값 = 100)를 날짜 인덱스 DataFrame으로 반환합니다."""
+        self.pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=geo)
+        df = self.pytrends.interest_over_time()
+        return df.drop(columns='isPartial', errors='ignore')
+
+
+class LocalTrendsProvider:
+    """
+    네트워크 없이 동작하는 테스트용 관심도 제공자.
+    키워드별로 고정된 합성 검색량을 만들고, Google Trends처럼 요청 내 최댓값을 100으로 맞춘 정수로 반환합니다.
+    """
+
+    max_keywords = MAX_KEYWORDS_PER_REQUEST
+
+    def __init__(self, fail_first=0):
+        self.calls = 0
+        self.fail_first = fail_first # 처음 n번의 요청은 실패 (재시도 확인용)
+
+    def _raw_volume(self, keyword, dates):
+        rng = np.random.RandomState(zlib.crc32(keyword.encode('utf-8')))
+        scale = rng.uniform(10, 1000)
+        noise = rng.gamma(2.0, 1.0, size=len(dates))
+        return scale * noise
+
+    def interest_over_time(self, keywords, timeframe, geo=GEO):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise ConnectionError("429 Too Many Requests (LocalTrendsProvider)")
+        start, end = timeframe.split()
+        dates = pd.date_range(start=start, end=end, freq='D')
+        raw = pd.DataFrame({keyword: self._raw_volume(keyword, dates) for keyword in keywords}, index=dates)
+        raw.index.name = 'date'
+        return (raw / raw.values.max() * 100).round().astype(int)
+
+
+# --- 캐시 + 배치 수집 ---
+class TrendsFetcher:
+    """
+    (키워드, 기간, 지역)별 관심도 시계열을 디스크에 캐시하며 묶음 단위로 수집합니다.
+    한 요청에 기준 키워드(anchor)를 항상 포함하고, 각 키워드 값을 같은 요청의 기준 키워드 합계로 나눈
+    '기준 키워드 단위'로 저장하므로 서로 다른 요청에서 받은 시계열도 같은 척도로 비교할 수 있습니다.
+    """
+
+    def __init__(self, provider=None, cache_dir=CACHE_DIR, geo=GEO, anchors=None, request_delay=REQUEST_DELAY,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE):
+        self._provider = provider # None이면 첫 캐시 미스 때 PytrendsProvider 생성 (TrendReq 생성 시 쿠키 요청이 발생하므로)
+        self.anchors = anchors or {} # {기간: 기준 키워드}, 없으면 요청 키워드의 첫 번째를 사용
+        self.cache_dir = cache_dir
+        self.geo = geo
+        self.request_delay = request_delay
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.request_count = 0 # 실제 제공자 호출 횟수 (재시도 포함)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def provider(self):
+        if self._provider is None:
+            self._provider = PytrendsProvider()
+        return self._provider
+
+    def _cache_path(self, keyword, timeframe, anchor):
+        key = '|'.join([keyword, timeframe, self.geo, anchor])
+        return os.path.join(self.cache_dir, hashlib.md5(key.encode('utf-8')).hexdigest() + '.csv')
+
+    def _load_cached(self, keyword, timeframe, anchor):
+        path = self._cache_path(keyword, timeframe, anchor)
+        if not os.path.exists(path):
+            return None
+        series = pd.read_csv(path, index_col=0, parse_dates=True).iloc[:, 0]
+        series.name = keyword
+        return series
+
+    def _save_cached(self, series, timeframe, anchor):
+        series.to_frame(series.name).to_csv(self._cache_path(series.name, timeframe, anchor), encoding='utf-8-sig')
+
+    def _request(self, keywords, timeframe):
+        """재시도와 지수 백오프를 적용하여 제공자에 한 번 요청합니다."""
+        for attempt in range(self.max_retries + 1):
+            if self.request_count > 0 and self.request_delay:
+                time.sleep(random.uniform(*self.request_delay))
+            self.request_count += 1
+            try:
+                return self.provider.interest_over_time(keywords, timeframe, self.geo)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"오류: 키워드 {keywords} 요청이 {self.max_retries}회 재시도 후에도 실패했습니다: {e}")
+                    raise
+                wait = self.backoff_base * (2 ** attempt) + random.uniform(0, 1)
+                print(f"경고: 키워드 {keywords} 요청 실패 ({e}). {wait:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                time.sleep(wait)
+
+    def fetch_anchored(self, keywords, timeframe, anchor=None):
+        """
+        키워드별 '기준 키워드 단위' 시계열을 DataFrame으로 반환합니다.
+        캐시에 없는 키워드만 (요청당 한도 - 1)개씩 기준 키워드와 함께 요청합니다.
+        """
+        keywords = list(dict.fromkeys(keywords))
+        anchor = anchor or self.anchors.get(timeframe) or keywords[0]
+        series = {}
+        missing = []
+        for keyword in keywords:
+            cached = self._load_cached(keyword, timeframe, anchor)
+            if cached is None:
+                missing.append(keyword)
+            else:
+                series[keyword] = cached
+
+        batches = []
+        if missing: # 캐시가 모두 있으면 제공자를 만들지도 않음 (네트워크 호출 없음)
+            batch_size = self.provider.max_keywords - 1
+            to_request = [keyword for keyword in missing if keyword != anchor]
+            batches = [to_request[i:i + batch_size] for i in range(0, len(to_request), batch_size)] or [[]]
+
+        for batch in batches:
+            df = self._request([anchor] + batch, timeframe)
+            if df.empty:
+                print(f"경고: 키워드 {[anchor] + batch}에 대한 관심도 데이터가 비어 있습니다. 0으로 채웁니다.")
+                start, end = timeframe.split()
+                df = pd.DataFrame(0, index=pd.date_range(start=start, end=end), columns=[anchor] + batch)
+
+            anchor_total = float(df[anchor].sum()) if anchor in df.columns else 0.0
+            if anchor_total == 0:
+                print(f"경고: 기준 키워드 '{anchor}'의 관심도가 0이어서 재조정할 수 없습니다. 원래 값(÷100)을 사용합니다.")
+                anchor_total = 100.0
+
+            for keyword in [anchor] + batch:
+                values = df[keyword] if keyword in df.columns else pd.Series(0, index=df.index)
+                anchored = (values / anchor_total).rename(keyword)
+                anchored.index.name = 'date'
+                self._save_cached(anchored, timeframe, anchor)
+                series[keyword] = anchored
+
+        return pd.concat([series[keyword] for keyword in keywords], axis=1)
+
+    def fetch_individual(self, keywords, timeframe, anchor=None):
+        """키워드별 최댓값을 100으로 맞춘 절대 추이 (fetch_individual_trends와 같은 의미)."""
+        return to_individual(self.fetch_anchored(keywords, timeframe, anchor))
+
+    def fetch_relative(self, keywords, timeframe, anchor=None):
+        """키워드 전체의 최댓값을 100으로 맞춘 상대 비교 (fetch_relative_trends와 같은 의미)."""
+        return to_relative(self.fetch_anchored(keywords, timeframe, anchor))
+
+
+def fetch_all_elections(fetcher, theme_keywords, elections=None, output_dir=None):
+    """
+    대선별로 모든 후보의 테마주 키워드를 같은 기준 키워드로 한 번에 수집하여
+    {(대선, 후보): (개별 추이 DataFrame, 상대 비교 DataFrame)}을 반환합니다.
+    """
+    results = {}
+    for election in elections or ELECTION_TIMEFRAMES:
+        if election not in theme_keywords:
+            print(f"경고: {election} 대선의 테마주 키워드가 없습니다.")
+            continue
+        timeframe = ELECTION_TIMEFRAMES[election]
+        candidates = theme_keywords[election]
+        all_keywords = [keyword for keywords in candidates.values() for keyword in keywords]
+        anchored = fetcher.fetch_anchored(all_keywords, timeframe)
+
+        for candidate, keywords in candidates.items():
+            df = anchored[list(dict.fromkeys(keywords))]
+            individual_df = to_individual(df)
+            relative_df = to_relative(df)
+            results[(election, candidate)] = (individual_df, relative_df)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                individual_df.to_csv(os.path.join(output_dir, f"{election}_{candidate}_theme_individual.csv"), encoding='utf-8-sig')
+                relative_df.to_csv(os.path.join(output_dir, f"{election}_{candidate}_theme_relative.csv"), encoding='utf-8-sig')
+        print(f"정보: {election} 대선 후보 {len(candidates)}명, 키워드 {len(set(all_keywords))}개 수집 완료. (누적 요청 {fetcher.request_count}회)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대선 후보 테마주 관심도(Google Trends) 캐시/배치 수집기")
+    parser.add_argument('-f', '--file', type=str, default=STOCK_LIST_PATH,
+                        help="테마주 목록 CSV 파일 경로 (기본값: 비정형데이터/stock_community/data/stock_list.csv)")
+    parser.add_argument('-e', '--elections', type=str, nargs='*', default=None,
+                        help="수집할 대선 (예: 20대 21대, 기본값: 전체)")
+    parser.add_argument('-c', '--cache_dir', type=str, default=CACHE_DIR,
+                        help="관심도 시계열 캐시 디렉토리 (기본값: candidate_theme_trends/cache)")
+    parser.add_argument('-o', '--output_dir', type=str, default=None,
+                        help="후보별 개별/상대 관심도 CSV를 저장할 디렉토리")
+    parser.add_argument('--local', action='store_true',
+                        help="네트워크 대신 합성 데이터를 반환하는 LocalTrendsProvider 사용 (테스트용)")
+    args = parser.parse_args()
+
+    theme_keywords = load_theme_keywords(args.file)
+    provider = LocalTrendsProvider() if args.local else None
+    fetcher = TrendsFetcher(provider, cache_dir=args.cache_dir, anchors=default_anchors(theme_keywords),
+                            request_delay=None if args.local else REQUEST_DELAY)
+    fetch_all_elections(fetcher, theme_keywords, args.elections, args.output_dir)
+    print(f"정보: 총 네트워크 요청 {fetcher.request_count}회")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+
+# 전역 설정
+INDEX_DIR = 'output/index'
+TEXT_COLUMNS = ['article_title', 'article_content', 'article_comments']
+MAX_TERM_LENGTH = 30 # 이보다 긴 토큰은 색인하지 않음 (URL, 반복 문자 등)
+MERGE_FACTOR = 10 # 같은 크기 등급(문서 수 자릿수)의 세그먼트가 이만큼 모이면 그 세그먼트들만 하나로 병합
+MANIFEST_FILE = 'manifest.json'
+_EPOCH = datetime.date(1970, 1, 1)
+_index_lock = threading.Lock() # 크롤러 작업자 스레드 간 색인 갱신 직렬화
+_open_indexes = {} # 크롤러 작업자 스레드가 공유하는 색인 객체 (세그먼트/색인 키 캐시 재사용)
+
+
+# --- 토크나이저 ---
+def _bigram_tokenize(text):
+    """
+    형태소 분석기가 없을 때 사용하는 토크나이저. 한글/숫자/영문 경계에서 먼저 나눈 뒤('윤석열vs이재명' -> 윤석열, vs, 이재명)
+    한글은 음절 bigram으로, 그 외는 단어 그대로 분리합니다.
+    """
+    tokens = []
+    for word in re.findall(r'[가-힣]+|[0-9]+|[a-z]+', text.lower()):
+        if word[0] >= '가' and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def get_tokenizer(name='okt'):
+    """
+    색인/검색에 사용할 토크나이저 함수를 반환합니다.
+    'okt'는 konlpy 형태소 분석기(Okt.morphs), 'bigram'은 음절 bigram 분리입니다.
+    """
+    if name == 'bigram':
+        return _bigram_tokenize
+    if name != 'okt':
+        raise ValueError(f"지원하지 않는 토크나이저입니다: {name} (가능: okt, bigram)")
+
+    try:
+        from konlpy.tag import Okt
+        okt = Okt()
+    except Exception as e:
+        raise ImportError(f"형태소 기반 색인에는 konlpy(및 Java)가 필요합니다. --tokenizer bigram을 사용할 수 있습니다: {e}")
+
+    def okt_tokenize(text):
+        return [token for token in (t.lower() for t in okt.morphs(text)) if re.search(r'[0-9a-z가-힣]', token)]
+    return okt_tokenize
+
+
+def default_tokenizer_name():
+    """konlpy를 사용할 수 있으면 'okt', 아니면 'bigram'을 반환합니다."""
+    try:
+        get_tokenizer('okt')
+        return 'okt'
+    except ImportError:
+        return 'bigram'
+
+
+# --- 정수 배열 압축 (delta + variable byte) ---
+def _vbyte_bytes(deltas):
+    """정수 배열의 각 값을 가변 바이트(7bit + 종료 비트)로 인코딩하여 (바이트 배열, 값별 바이트 수)를 반환합니다."""
+    deltas = np.asarray(deltas, dtype=np.uint64)
+    nbytes = np.ones(len(deltas), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        nbytes += deltas >= np.uint64(1 << shift)
+    owner = np.repeat(np.arange(len(deltas)), nbytes)
+    position = np.arange(len(owner)) - np.repeat(np.cumsum(nbytes) - nbytes, nbytes)
+    encoded = (deltas[owner] >> (np.uint64(7) * position.astype(np.uint64))) & np.uint64(0x7F)
+    encoded |= np.where(position == nbytes[owner] - 1, np.uint64(0x80), np.uint64(0))
+    return encoded.astype(np.uint8), nbytes
+
+
+def _vbyte_values(buffer):
+    """가변 바이트 배열을 값 배열로 복원합니다. (delta 누적 전)"""
+    buffer = np.asarray(buffer, dtype=np.uint8)
+    if len(buffer) == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(buffer & 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    position = np.arange(len(buffer)) - np.repeat(starts, ends - starts + 1)
+    parts = (buffer & 0x7F).astype(np.uint64) << (np.uint64(7) * position.astype(np.uint64))
+    return np.add.reduceat(parts, starts).astype(np.int64)
+
+
+def vbyte_encode(values):
+    """정렬된 정수 배열을 delta 후 가변 바이트(7bit + 종료 비트)로 압축합니다."""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return _vbyte_bytes(np.diff(values, prepend=np.uint64(0)))[0]
+
+
+def vbyte_decode(buffer):
+    """vbyte_encode로 압축한 바이트 배열을 정수 배열로 복원합니다."""
+    return np.cumsum(_vbyte_values(buffer))
+
+
+def encode_postings(term_ids, doc_nos, num_terms):
+    """
+    (토큰 번호, 문서 번호) 순으로 정렬된 쌍 전체를 토큰별 delta + vbyte postings로 한 번에 압축합니다.
+    (postings 바이트 배열, 토큰별 시작 위치 offsets)를 반환합니다.
+    """
+    term_ids = np.asarray(term_ids, dtype=np.int64)
+    doc_nos = np.asarray(doc_nos, dtype=np.int64)
+    deltas = np.diff(doc_nos, prepend=0)
+    term_starts = np.flatnonzero(np.diff(term_ids, prepend=-1))
+    deltas[term_starts] = doc_nos[term_starts] # 토큰이 바뀌면 delta를 처음부터 다시 계산
+    encoded, nbytes = _vbyte_bytes(deltas)
+    offsets = np.zeros(num_terms + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(term_ids, weights=nbytes, minlength=num_terms)).astype(np.int64)
+    return encoded, offsets
+
+
+def decode_postings(postings, offsets):
+    """세그먼트의 postings 전체를 한 번에 풀어 (토큰 번호, 문서 번호) 배열을 반환합니다."""
+    postings = np.asarray(postings, dtype=np.uint8)
+    deltas = _vbyte_values(postings)
+    value_offsets = np.searchsorted(np.flatnonzero(postings & 0x80), offsets) # 토큰별 시작 값 위치
+    counts = np.diff(value_offsets)
+    cumsum = np.cumsum(deltas)
+    term_base = cumsum[value_offsets[:-1]] - deltas[value_offsets[:-1]] if len(deltas) else np.zeros(len(counts), dtype=np.int64)
+    return np.repeat(np.arange(len(counts)), counts), cumsum - np.repeat(term_base, counts)
+
+
+# --- 세그먼트 ---
+def _article_id(url):
+    """게시글 URL의 nid 값을 게시글 ID로 사용합니다."""
+    match = re.search(r'nid=(\d+)', str(url))
+    return int(match.group(1)) if match else -1
+
+
+def _doc_keys(article_ids, elections, candidates):
+    """같은 게시글이 여러 대선/후보 파일에 있을 수 있으므로 (게시글 ID, 대선, 후보)를 문서 키로 사용합니다."""
+    return (pd.Series(article_ids).astype(str) + '|' + pd.Series(elections).fillna('').astype(str).to_numpy()
+            + '|' + pd.Series(candidates).fillna('').astype(str).to_numpy()).to_numpy()
+
+
+def _date_to_days(series):
+    dates = pd.to_datetime(series, errors='coerce')
+    days = (dates - pd.Timestamp(_EPOCH)).dt.days
+    return days.fillna(-1).astype(np.int32).to_numpy()
+
+
+def _days_to_date(days):
+    return (_EPOCH + datetime.timedelta(days=int(days))).isoformat()
+
+
+def _parse_date(date_str):
+    if not date_str:
+        return None
+    return (pd.Timestamp(date_str).date() - _EPOCH).days
+
+
+def write_segment(segment_dir, df, tokenize):
+    """
+    DataFrame 한 묶음을 세그먼트로 색인하여 저장합니다.
+    - terms.npy    : 정렬된 토큰 배열
+    - offsets.npy  : 토큰별 postings 시작 바이트 위치 (길이 = 토큰 수 + 1)
+    - postings.bin : 세그먼트 내 문서 번호의 delta + vbyte 압축 배열
+    - docs.npz     : 문서별 필터 컬럼 (stock_code, vote_candidate, vote_election, 날짜, 게시글 ID)
+    """
+    postings = defaultdict(list)
+    text = df[TEXT_COLUMNS[0]].fillna('').astype(str)
+    for col in TEXT_COLUMNS[1:]:
+        text = text + ' ' + df[col].fillna('').astype(str)
+
+    for doc_no, doc_text in enumerate(text):
+        for term in set(tokenize(doc_text)):
+            if len(term) <= MAX_TERM_LENGTH:
+                postings[term].append(doc_no)
+
+    terms = sorted(postings)
+    counts = [len(postings[term]) for term in terms]
+    doc_nos = np.fromiter(chain.from_iterable(postings[term] for term in terms), dtype=np.int64, count=sum(counts))
+    encoded, offsets = encode_postings(np.repeat(np.arange(len(terms)), counts), doc_nos, len(terms))
+    _save_segment_files(segment_dir, np.array(terms, dtype=f'<U{MAX_TERM_LENGTH}'), encoded, offsets, dict(
+        stock_code=df['stock_code'].astype(str).str.zfill(6).to_numpy(dtype=str),
+        vote_candidate=df['vote_candidate'].fillna('').astype(str).to_numpy(dtype=str),
+        vote_election=df['vote_election'].fillna('').astype(str).to_numpy(dtype=str),
+        article_date=_date_to_days(df['article_date']),
+        article_id=df['article_url'].map(_article_id).to_numpy(dtype=np.int64),
+    ))
+    return len(terms)
+
+
+def _save_segment_files(segment_dir, terms, encoded, offsets, docs):
+    os.makedirs(segment_dir, exist_ok=True)
+    np.save(os.path.join(segment_dir, 'terms.npy'), terms)
+    np.save(os.path.join(segment_dir, 'offsets.npy'), offsets)
+    encoded.tofile(os.path.join(segment_dir, 'postings.bin'))
+    np.savez(os.path.join(segment_dir, 'docs.npz'), **docs)
+
+
+class Segment:
+    """디스크의 세그먼트 하나를 메모리 맵으로 열어 토큰별 문서 번호를 조회합니다."""
+
+    def __init__(self, segment_dir):
+        self.terms = np.load(os.path.join(segment_dir, 'terms.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(segment_dir, 'offsets.npy'), mmap_mode='r')
+        postings_path = os.path.join(segment_dir, 'postings.bin')
+        self.postings = np.memmap(postings_path, dtype=np.uint8, mode='r') if os.path.getsize(postings_path) else np.zeros(0, dtype=np.uint8)
+        with np.load(os.path.join(segment_dir, 'docs.npz')) as docs:
+            self.docs = {key: docs[key] for key in docs.files}
+
+    def __len__(self):
+        return len(self.docs['article_id'])
+
+    def lookup(self, term):
+        """토큰이 등장한 세그먼트 내 문서 번호 배열을 반환합니다."""
+        pos = int(np.searchsorted(self.terms, term))
+        if pos >= len(self.terms) or self.terms[pos] != term:
+            return np.zeros(0, dtype=np.int64)
+        return vbyte_decode(self.postings[self.offsets[pos]:self.offsets[pos + 1]])
+
+    def search(self, tokens, stock_codes=None, candidates=None, start_days=None, end_days=None):
+        """모든 토큰을 포함하고 필터 조건을 만족하는 문서 번호 배열을 반환합니다."""
+        doc_nos = None
+        for token in tokens:
+            found = self.lookup(token)
+            doc_nos = found if doc_nos is None else np.intersect1d(doc_nos, found, assume_unique=True)
+            if len(doc_nos) == 0:
+                return doc_nos
+        if doc_nos is None:
+            doc_nos = np.arange(len(self))
+
+        mask = np.ones(len(doc_nos), dtype=bool)
+        if stock_codes:
+            mask &= np.isin(self.docs['stock_code'][doc_nos], stock_codes)
+        if candidates:
+            mask &= np.isin(self.docs['vote_candidate'][doc_nos], candidates)
+        if start_days is not None:
+            mask &= self.docs['article_date'][doc_nos] >= start_days
+        if end_days is not None:
+            mask &= self.docs['article_date'][doc_nos] <= end_days
+        return doc_nos[mask]
+
+
+# --- 색인 관리 ---
+class CorpusIndex:
+    """
+    세그먼트 단위 역색인.
+    새로 수집된 게시글은 새 세그먼트로 추가되며(증분 색인), 이미 색인한 게시글인지는 (게시글 ID(nid), 대선, 후보)로 판단합니다.
+    세그먼트는 문서 수 자릿수로 등급을 나누고, 같은 등급이 MERGE_FACTOR개 모이면 그 세그먼트들만 병합합니다. (단계적 병합)
+    """
+
+    def __init__(self, index_dir=INDEX_DIR, tokenizer=None):
+        self.index_dir = index_dir
+        manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+        self._manifest_mtime = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            self._manifest_mtime = os.path.getmtime(manifest_path)
+            if tokenizer and tokenizer != self.manifest['tokenizer']:
+                raise ValueError(f"기존 색인의 토크나이저({self.manifest['tokenizer']})와 다릅니다: {tokenizer}")
+        else:
+            self.manifest = {'tokenizer': tokenizer or default_tokenizer_name(), 'segments': [], 'next_segment': 0}
+        self.tokenize = get_tokenizer(self.manifest['tokenizer'])
+        self._segments = None
+        self._doc_key_set = None
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            self._segments = [Segment(os.path.join(self.index_dir, name)) for name in self.manifest['segments']]
+        return self._segments
+
+    def is_stale(self):
+        """다른 프로세스(CLI 등)가 manifest를 바꿨으면 True를 반환합니다."""
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILE)
+        mtime = os.path.getmtime(manifest_path) if os.path.exists(manifest_path) else None
+        return mtime != self._manifest_mtime
+
+    def _save_manifest(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        manifest_path = os.path.join(self.index_dir, MANIFEST_FILE)
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        self._manifest_mtime = os.path.getmtime(manifest_path)
+
+    def indexed_doc_keys(self):
+        """색인된 문서의 (게시글 ID, 대선, 후보) 키 집합. 처음 한 번만 세그먼트에서 읽고 이후에는 추가분만 갱신합니다."""
+        if self._doc_key_set is None:
+            self._doc_key_set = set()
+            for segment in self.segments:
+                self._doc_key_set.update(_doc_keys(segment.docs['article_id'], segment.docs['vote_election'], segment.docs['vote_candidate']))
+        return self._doc_key_set
+
+    def add_dataframe(self, df):
+        """DataFrame을 새 세그먼트로 색인합니다."""
+        if df.empty:
+            return
+        name = f"seg_{self.manifest['next_segment']:05d}"
+        segment_dir = os.path.join(self.index_dir, name)
+        num_terms = write_segment(segment_dir, df.reset_index(drop=True), self.tokenize)
+        self.manifest['segments'].append(name)
+        self.manifest['next_segment'] += 1
+        if self._segments is not None:
+            self._segments.append(Segment(segment_dir))
+        print(f"정보: 세그먼트 '{name}' 추가 완료. (문서 {len(df)}건, 토큰 {num_terms}개)")
+
+    def add_new_rows(self, df):
+        """아직 색인하지 않은 게시글만 새 세그먼트로 색인하고, 크기 등급이 같은 세그먼트가 쌓이면 병합합니다."""
+        if not df.empty:
+            article_ids = df['article_url'].map(_article_id).to_numpy(dtype=np.int64)
+            if (article_ids < 0).any():
+                print(f"경고: 게시글 ID(nid)가 없는 행 {(article_ids < 0).sum()}건은 색인하지 않습니다.")
+            doc_keys = pd.Series(_doc_keys(article_ids, df['vote_election'], df['vote_candidate']))
+            indexed = self.indexed_doc_keys()
+            is_new = ((article_ids >= 0) & ~doc_keys.duplicated().to_numpy()
+                      & np.fromiter((key not in indexed for key in doc_keys), dtype=bool, count=len(doc_keys)))
+            df = df[is_new]
+
+        if df.empty:
+            print("정보: 새로 색인할 행이 없습니다.")
+            return
+        self.add_dataframe(df)
+        self.indexed_doc_keys().update(doc_keys[is_new])
+        self.merge_tiers()
+        self._save_manifest()
+
+    def update(self, file_paths):
+        """
+        소스 CSV에서 아직 색인하지 않은 게시글만 골라 증분 색인합니다.
+        크롤러는 매번 CSV 전체를 다시 쓰므로 행 위치가 아니라 (게시글 ID(nid), 대선, 후보)로 새 게시글을 판단합니다.
+        """
+        frames = []
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                print(f"경고: 색인할 파일이 없습니다: '{file_path}'")
+                continue
+            frames.append(pd.read_csv(file_path, dtype={'stock_code': str}, encoding='utf-8-sig', low_memory=False))
+        self.add_new_rows(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
+
+    def merge_tiers(self):
+        """문서 수 자릿수가 같은 세그먼트가 MERGE_FACTOR개 이상이면 그 세그먼트들만 병합합니다. (작은 등급부터 반복)"""
+        while True:
+            tiers = defaultdict(list)
+            for name, segment in zip(self.manifest['segments'], self.segments):
+                tiers[len(str(len(segment)))].append(name)
+            full_tiers = [names for _, names in sorted(tiers.items()) if len(names) >= MERGE_FACTOR]
+            if not full_tiers:
+                return
+            self._merge_segments(full_tiers[0])
+
+    def compact(self):
+        """모든 세그먼트를 하나로 병합합니다."""
+        if len(self.manifest['segments']) <= 1:
+            return
+        self._merge_segments(list(self.manifest['segments']))
+        self._save_manifest()
+
+    def _merge_segments(self, names):
+        """지정한 세그먼트들을 하나로 병합합니다. (postings를 한 번에 풀어 문서 번호를 재배치한 뒤 다시 압축)"""
+        segments = dict(zip(self.manifest['segments'], self.segments))
+        merging = [segments[old] for old in names]
+        terms = np.unique(np.concatenate([np.asarray(segment.terms) for segment in merging]))
+        term_ids, doc_nos, docs = [], [], defaultdict(list)
+        base = 0
+        for segment in merging:
+            segment_term_ids, segment_doc_nos = decode_postings(segment.postings, segment.offsets)
+            term_ids.append(np.searchsorted(terms, np.asarray(segment.terms))[segment_term_ids])
+            doc_nos.append(segment_doc_nos + base)
+            for key, values in segment.docs.items():
+                docs[key].append(values)
+            base += len(segment)
+
+        # 세그먼트 순서대로 문서 번호가 커지므로 토큰 번호로만 안정 정렬하면 토큰 내 문서 번호 순서가 유지됨
+        term_ids, doc_nos = np.concatenate(term_ids), np.concatenate(doc_nos)
+        order = np.argsort(term_ids, kind='stable')
+        encoded, offsets = encode_postings(term_ids[order], doc_nos[order], len(terms))
+
+        name = f"seg_{self.manifest['next_segment']:05d}"
+        segment_dir = os.path.join(self.index_dir, name)
+        _save_segment_files(segment_dir, terms.astype(f'<U{MAX_TERM_LENGTH}'), encoded, offsets,
+                            {key: np.concatenate(values) for key, values in docs.items()})
+
+        kept = [seg for seg in self.manifest['segments'] if seg not in names]
+        self._segments = [segments[seg] for seg in kept] + [Segment(segment_dir)]
+        self.manifest['segments'] = kept + [name]
+        self.manifest['next_segment'] += 1
+        for old in names:
+            shutil.rmtree(os.path.join(self.index_dir, old), ignore_errors=True)
+        print(f"정보: 세그먼트 {len(names)}개를 '{name}'으로 병합했습니다. (문서 {base}건, 토큰 {len(terms)}개)")
+
+    def query(self, text, stock_codes=None, candidates=None, start_date=None, end_date=None):
+        """
+        검색어의 모든 토큰을 포함하는 게시글을 찾아 일별 건수와 게시글 ID 목록을 반환합니다.
+        start_date, end_date는 'YYYY-MM-DD' 형식이며 양 끝을 포함합니다.
+        """
+        tokens = sorted(set(self.tokenize(text)))
+        start_days, end_days = _parse_date(start_date), _parse_date(end_date)
+        dates, article_ids = [], []
+        for segment in self.segments:
+            doc_nos = segment.search(tokens, stock_codes, candidates, start_days, end_days)
+            dates.append(segment.docs['article_date'][doc_nos])
+            article_ids.append(segment.docs['article_id'][doc_nos])
+
+        dates = np.concatenate(dates) if dates else np.zeros(0, dtype=np.int32)
+        article_ids = np.concatenate(article_ids) if article_ids else np.zeros(0, dtype=np.int64)
+        days, counts = np.unique(dates[dates >= 0], return_counts=True)
+        return {
+            'query': text,
+            'tokens': tokens,
+            'total': int(len(article_ids)),
+            'daily_counts': {_days_to_date(day): int(count) for day, count in zip(days, counts)},
+            'article_ids': article_ids.tolist(),
+        }
+
+
+def build_index(file_paths, index_dir=INDEX_DIR, tokenizer=None):
+    """기존 색인을 지우고 주어진 CSV 파일 전체로 색인을 새로 만듭니다."""
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+    index = CorpusIndex(index_dir, tokenizer)
+    index.update(file_paths)
+    index.compact()
+    return index
+
+
+def update_corpus_index(index_dir, articles):
+    """
+    크롤러에서 호출하는 증분 색인 함수. 새로 수집한 게시글(dict 목록 또는 DataFrame)만 받아 색인합니다.
+    색인 객체는 디렉토리별로 재사용하며(다른 프로세스가 색인을 바꾸면 다시 열기), 여러 작업자 스레드에서 호출해도 순서대로 처리됩니다.
+    """
+    with _index_lock:
+        try:
+            index = _open_indexes.get(index_dir)
+            if index is None or index.is_stale():
+                index = _open_indexes[index_dir] = CorpusIndex(index_dir)
+            index.add_new_rows(pd.DataFrame(articles))
+        except Exception as e:
+            print(f"오류: 역색인 갱신 중 오류 발생: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="종목 토론방 게시글 역색인 생성 및 검색")
+    parser.add_argument('--index_dir', type=str, default=INDEX_DIR,
+                        help="색인 디렉토리 (기본값: output/index)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, help_text in [('build', "색인을 새로 생성"), ('update', "새로 추가된 행만 증분 색인")]:
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument('-i', '--input', type=str, default='output/csv/*_cleaned.csv',
+                         help="색인할 CSV 파일 경로 또는 glob 패턴 (기본값: output/csv/*_cleaned.csv)")
+        sub.add_argument('--tokenizer', type=str, default=None, choices=['okt', 'bigram'],
+                         help="토크나이저 (기본값: konlpy 사용 가능 시 okt, 아니면 bigram)")
+
+    subparsers.add_parser('compact', help="세그먼트를 하나로 병합")
+
+    query_parser = subparsers.add_parser('query', help="검색어로 게시글 검색")
+    query_parser.add_argument('text', type=str, help="검색어 (예: '탈모약 건강보험')")
+    query_parser.add_argument('-s', '--stock_code', type=str, nargs='*', default=None, help="종목 코드 필터")
+    query_parser.add_argument('-c', '--candidate', type=str, nargs='*', default=None, help="후보 필터 (vote_candidate)")
+    query_parser.add_argument('--start', type=str, default=None, help="시작 날짜 (YYYY-MM-DD)")
+    query_parser.add_argument('--end', type=str, default=None, help="종료 날짜 (YYYY-MM-DD)")
+    query_parser.add_argument('--ids', action='store_true', help="게시글 ID 목록 출력")
+    args = parser.parse_args()
+
+    if args.command in ('build', 'update'):
+        file_paths = sorted(glob.glob(args.input))
+        if not file_paths:
+            print(f"경고: '{args.input}'에 해당하는 파일이 없습니다. 프로그램을 종료합니다.")
+            return
+        if args.command == 'build':
+            build_index(file_paths, args.index_dir, args.tokenizer)
+        else:
+            CorpusIndex(args.index_dir, args.tokenizer).update(file_paths)
+    elif args.command == 'compact':
+        CorpusIndex(args.index_dir).compact()
+    else:
+        start_time = time.perf_counter()
+        result = CorpusIndex(args.index_dir).query(args.text, args.stock_code, args.candidate, args.start, args.end)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"검색어: {result['query']} (토큰: {', '.join(result['tokens'])}) - 총 {result['total']}건 ({elapsed_ms:.1f}ms)")
+        for day, count in result['daily_counts'].items():
+            print(f"{day}\t{count}")
+        if args.ids:
+            print(' '.join(str(article_id) for article_id in result['article_ids']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import argparse
+import glob
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# 전역 설정
+NUM_PERM = 128 # MinHash 서명 길이 (해시 함수 수)
+NUM_BANDS = 16 # LSH 밴드 수 (밴드당 행 수 = NUM_PERM / NUM_BANDS)
+SHINGLE_SIZE = 3 # 문자 n-gram 크기 (한국어는 띄어쓰기가 불규칙하므로 문자 단위 사용)
+SIMILARITY_THRESHOLD = 0.8 # 추정 자카드 유사도가 이 값 이상이면 중복으로 판단
+DEDUP_MODES = ['off', 'flag', 'skip', 'merge']
+ENGAGEMENT_COLUMNS = ['article_viewers', 'article_likes', 'article_dislikes']
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+# --- 유틸리티 함수 ---
+def normalize_text(text):
+    """공백, 특수문자를 제거하고 소문자로 변환하여 비교용 문자열을 만듭니다."""
+    if not isinstance(text, str):
+        return ""
+    return re.sub(r'[^0-9a-z가-힣]', '', text.lower())
+
+
+def make_shingles(text, shingle_size=SHINGLE_SIZE):
+    """정규화된 문자열을 문자 n-gram 해시(uint64 배열)로 변환합니다."""
+    if len(text) <= shingle_size:
+        grams = {text}
+    else:
+        grams = {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def dedup_key(article_data):
+    """
+    중복 탐지 인덱스 키를 만듭니다. 크롤링/출력 파일 단위인 (대선, 후보, 종목코드)를 사용하므로
+    같은 종목이라도 다른 대선/후보의 게시글과는 비교하지 않습니다.
+    """
+    parts = (article_data.get('vote_election'), article_data.get('vote_candidate'), article_data.get('stock_code'))
+    return "_".join(str(part) for part in parts if isinstance(part, str) and part) or "unknown"
+
+
+def parse_count(value):
+    """'1,234' 같은 조회수/공감수 문자열을 정수로 변환합니다. 변환할 수 없으면 0을 반환합니다."""
+    digits = re.sub(r'[^\d]', '', str(value))
+    return int(digits) if digits else 0
+
+
+class MinHasher:
+    """문자 n-gram 집합에 대한 MinHash 서명을 계산합니다."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    def signature(self, shingles):
+        """(a * x + b) mod p 해시 중 최솟값을 순열별로 구해 uint32 서명으로 반환합니다."""
+        hashed = (np.outer(shingles, self.a) + self.b) % np.uint64(_MERSENNE_PRIME)
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+class StockDuplicateIndex:
+    """
+    단일 종목의 MinHash/LSH 인덱스.
+    서명은 uint32 배열로, LSH 버킷은 밴드별 dict로 메모리에 보관하며 npz 파일로 저장/복원할 수 있습니다.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, num_bands=NUM_BANDS):
+        if num_perm % num_bands != 0:
+            raise ValueError(f"num_perm({num_perm})은 num_bands({num_bands})로 나누어떨어져야 합니다.")
+        self.num_bands = num_bands
+        self.rows_per_band = num_perm // num_bands
+        self.keys = []
+        self.key_set = set() # 이미 색인한 게시글 키 (저장된 인덱스를 다시 불러왔을 때 자기 자신과 비교하지 않도록)
+        self.signatures = []
+        self.buckets = [dict() for _ in range(num_bands)]
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.key_set
+
+    def _band_hashes(self, signature):
+        bands = signature.reshape(self.num_bands, self.rows_per_band)
+        return [band.tobytes() for band in bands]
+
+    def query(self, signature, threshold=SIMILARITY_THRESHOLD):
+        """가장 유사한 기존 게시글의 (키, 추정 유사도)를 반환합니다. 임계값 미만이면 (None, 유사도)."""
+        candidates = set()
+        for band_no, band_hash in enumerate(self._band_hashes(signature)):
+            candidates.update(self.buckets[band_no].get(band_hash, ()))
+        if not candidates:
+            return None, 0.0
+
+        candidates = sorted(candidates)
+        similarities = (np.vstack([self.signatures[i] for i in candidates]) == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        best_similarity = float(similarities[best])
+        if best_similarity >= threshold:
+            return self.keys[candidates[best]], best_similarity
+        return None, best_similarity
+
+    def add(self, key, signature):
+        """게시글 서명을 인덱스에 추가합니다."""
+        position = len(self.keys)
+        self.keys.append(key)
+        self.key_set.add(key)
+        self.signatures.append(signature)
+        for band_no, band_hash in enumerate(self._band_hashes(signature)):
+            self.buckets[band_no].setdefault(band_hash, []).append(position)
+
+    def save(self, file_path):
+        """인덱스를 npz 파일로 저장합니다."""
+        if not self.keys:
+            return
+        np.savez_compressed(file_path, keys=np.array(self.keys, dtype=str), signatures=np.vstack(self.signatures))
+
+    def load(self, file_path):
+        """npz 파일에서 서명을 읽어 LSH 버킷을 다시 구성합니다."""
+        data = np.load(file_path)
+        for key, signature in zip(data['keys'].tolist(), data['signatures']):
+            self.add(key, signature)
+
+
+class NearDuplicateDetector:
+    """
+    크롤링 중 (대선, 후보, 종목)별로 스팸/복붙 게시글을 탐지합니다.
+    mode
+        - 'flag'  : 중복 게시글도 저장하되 is_duplicate, duplicate_of 컬럼으로 표시
+        - 'skip'  : 중복 게시글은 저장하지 않음
+        - 'merge' : 중복 게시글은 저장하지 않고 조회수/공감/비공감 수를 원본 게시글에 합산
+                    (원본이 이번 호출의 canonical_records에 없으면 합산할 수 없으므로 flag처럼 표시하여 저장)
+    """
+
+    def __init__(self, mode='flag', threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM, num_bands=NUM_BANDS, index_dir=None):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"지원하지 않는 중복 처리 모드입니다: {mode} (가능: {', '.join(DEDUP_MODES)})")
+        self.mode = mode
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.index_dir = index_dir
+        self.hasher = MinHasher(num_perm)
+        self.indexes = {}
+        self.report = []
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def get_index(self, index_key):
+        """(대선, 후보, 종목) 인덱스를 반환합니다. 저장된 인덱스 파일이 있으면 불러옵니다."""
+        with self.lock:
+            if index_key not in self.indexes:
+                index = StockDuplicateIndex(self.num_perm, self.num_bands)
+                if self.index_dir:
+                    file_path = os.path.join(self.index_dir, f"{index_key}.npz")
+                    if os.path.exists(file_path):
+                        index.load(file_path)
+                        print(f"정보: {index_key} - 중복 탐지 인덱스 {len(index)}건을 불러왔습니다.")
+                self.indexes[index_key] = index
+            return self.indexes[index_key]
+
+    def check(self, index_key, key, text):
+        """
+        게시글이 기존 게시글과 중복인지 확인합니다.
+        중복이면 (원본 키, 유사도)를, 아니면 인덱스에 추가한 뒤 (None, 유사도)를 반환합니다.
+        이미 인덱스에 있는 키(이전 실행에서 원본으로 색인한 게시글을 다시 수집한 경우)는 중복이 아니며 다시 추가하지 않습니다.
+        """
+        normalized = normalize_text(text)
+        if not normalized:
+            return None, 0.0
+        signature = self.hasher.signature(make_shingles(normalized))
+        index = self.get_index(index_key)
+        with index.lock:
+            if key in index:
+                return None, 0.0
+            duplicate_of, similarity = index.query(signature, self.threshold)
+            if duplicate_of is None:
+                index.add(key, signature)
+        return duplicate_of, similarity
+
+    def apply(self, article_data, canonical_records=None):
+        """
+        크롤링한 게시글에 중복 처리 모드를 적용합니다.
+        게시글을 결과에 포함해야 하면 True, 제외해야 하면 False를 반환합니다.
+        canonical_records는 article_url -> 원본 게시글 dict로, merge 모드에서 참여 지표를 합산할 때 사용합니다.
+        원본이 canonical_records에 없으면(다른 파일/스레드의 게시글, 불러온 인덱스의 게시글) 지표를 잃지 않도록
+        게시글을 표시하여 남기고 리포트에 'unmerged'로 기록합니다.
+        """
+        if not self.enabled:
+            return True
+
+        index_key = dedup_key(article_data)
+        text = " ".join(value for value in (article_data.get('article_title'), article_data.get('article_content')) if isinstance(value, str))
+        duplicate_of, similarity = self.check(index_key, article_data['article_url'], text)
+
+        if duplicate_of is None:
+            if self.mode == 'flag':
+                article_data['is_duplicate'] = False
+                article_data['duplicate_of'] = ""
+            if canonical_records is not None:
+                canonical_records[article_data['article_url']] = article_data
+            return True
+
+        if self.mode == 'merge' and canonical_records is not None and duplicate_of in canonical_records:
+            canonical = canonical_records[duplicate_of]
+            for col in ENGAGEMENT_COLUMNS:
+                canonical[col] = parse_count(canonical.get(col)) + parse_count(article_data.get(col))
+            canonical['duplicate_count'] = canonical.get('duplicate_count', 0) + 1
+            action = 'merged'
+        elif self.mode == 'merge':
+            action = 'unmerged'
+        else:
+            action = self.mode
+
+        keep = action in ('flag', 'unmerged')
+        if keep:
+            article_data['is_duplicate'] = True
+            article_data['duplicate_of'] = duplicate_of
+
+        with self.lock:
+            self.report.append({
+                'dedup_key': index_key,
+                'stock_code': article_data.get('stock_code', ''),
+                'article_date': article_data.get('article_date', ''),
+                'article_title': article_data.get('article_title', ''),
+                'article_url': article_data['article_url'],
+                'duplicate_of': duplicate_of,
+                'similarity': round(similarity, 4),
+                'action': action,
+            })
+        print(f"정보: {index_key} - 중복 게시글 탐지 (유사도 {similarity:.2f}, 원본: {duplicate_of}). 처리: {action}")
+        return keep
+
+    def save_report(self, output_dir="output", filename="dedup_report.csv"):
+        """중복 탐지 결과를 CSV로 저장하고 종목별 요약을 출력합니다."""
+        if not self.report:
+            print("정보: 탐지된 중복 게시글이 없습니다.")
+            return pd.DataFrame()
+
+        df_report = pd.DataFrame(self.report)
+        os.makedirs(output_dir, exist_ok=True)
+        file_path = os.path.join(output_dir, filename)
+        df_report.to_csv(file_path, index=False, encoding='utf-8-sig')
+
+        summary = df_report.groupby('dedup_key').size()
+        for index_key, count in summary.items():
+            total = len(self.indexes[index_key]) + count if index_key in self.indexes else count
+            print(f"정보: {index_key} - 중복 {count}건 / 전체 {total}건 ({count / total:.1%})")
+        print(f"정보: 중복 게시글 리포트 {len(df_report)}건을 '{file_path}'에 저장했습니다.")
+        return df_report
+
+    def save_indexes(self):
+        """index_dir가 지정된 경우 (대선, 후보, 종목)별 인덱스를 저장합니다."""
+        if not self.index_dir:
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        for index_key, index in self.indexes.items():
+            index.save(os.path.join(self.index_dir, f"{index_key}.npz"))
+        print(f"정보: {len(self.indexes)}개의 중복 탐지 인덱스를 '{self.index_dir}'에 저장했습니다.")
+
+
+def dedup_dataframe(df, detector):
+    """
+    이미 수집된 게시글 DataFrame에 중복 처리를 적용합니다.
+    게시글 순서(최신순)대로 처리하므로 먼저 등장한 게시글이 원본이 됩니다.
+    """
+    kept = []
+    canonical_records = {}
+    for article_data in df.to_dict('records'):
+        if detector.apply(article_data, canonical_records):
+            kept.append(article_data)
+    return pd.DataFrame(kept, columns=None if kept else df.columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집된 종목 토론방 게시글의 유사 중복/스팸 제거")
+    parser.add_argument('-i', '--input', type=str, default='output/csv/*_cleaned.csv',
+                        help="중복 제거할 CSV 파일 경로 또는 glob 패턴 (기본값: output/csv/*_cleaned.csv)")
+    parser.add_argument('-o', '--output_dir', type=str, default='output/dedup',
+                        help="중복 제거 결과와 리포트를 저장할 디렉토리 (기본값: output/dedup)")
+    parser.add_argument('-m', '--mode', type=str, default='merge', choices=DEDUP_MODES[1:],
+                        help="중복 처리 모드 (flag, skip, merge / 기본값: merge)")
+    parser.add_argument('-t', '--threshold', type=float, default=SIMILARITY_THRESHOLD,
+                        help="중복 판단 유사도 임계값 (기본값: 0.8)")
+    parser.add_argument('--index_dir', type=str, default=None,
+                        help="종목별 중복 탐지 인덱스를 저장/복원할 디렉토리")
+    args = parser.parse_args()
+
+    file_paths = sorted(glob.glob(args.input))
+    if not file_paths:
+        print(f"경고: '{args.input}'에 해당하는 파일이 없습니다. 프로그램을 종료합니다.")
+        return
+
+    detector = NearDuplicateDetector(args.mode, args.threshold, index_dir=args.index_dir)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for file_path in file_paths:
+        df = pd.read_csv(file_path, dtype={'stock_code': str}, encoding='utf-8-sig')
+        df_dedup = dedup_dataframe(df, detector)
+        df_dedup.to_csv(os.path.join(args.output_dir, os.path.basename(file_path)), index=False, encoding='utf-8-sig')
+        print(f"정보: '{file_path}' {len(df)}건 -> {len(df_dedup)}건")
+
+    detector.save_report(args.output_dir)
+    detector.save_indexes()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import pandas as pd
 import os
 from concurrent.futures import ThreadPoolExecutor
 import argparse
+from near_duplicate_detector import NearDuplicateDetector, DEDUP_MODES, SIMILARITY_THRESHOLD
+from corpus_index import update_corpus_index
 
 
 # 전역 설정 (필요에 따라 config 파일로 분리 가능)
@@ -185,13 +187,16 @@ def page_move_by_list_button(driver, wait, stock_code, page_number, board_mode=F
     apply_random_delay()
 
 # --- 메인 크롤링 함수 ---
-def scrape_stock_articles_by_date_range(stock_data, proxy=None):
+def scrape_stock_articles_by_date_range(stock_data, proxy=None, detector=None, index_dir=None):
     """
     [작업자 함수] 특정 종목에 대해 지정된 날짜 범위 내의 게시글을 크롤링합니다.
     각 스레드에서 독립적으로 실행됩니다.
+    detector가 주어지면 유사 중복/스팸 게시글을 모드에 따라 표시, 제외 또는 원본에 병합합니다.
+    index_dir가 주어지면 페이지를 CSV에 저장할 때마다 새 게시글을 역색인에 추가합니다.
     """
     driver = initialize_driver(proxy)
     all_articles_data = []
+    canonical_records = {} # article_url -> 원본 게시글 (중복 병합용)
 
     stock_code = stock_data['stock_code']
     stock_name = stock_data['stock_name']
@@ -436,6 +441,7 @@ def scrape_stock_articles_by_date_range(stock_data, proxy=None):
         
         stop_crawling = False
         current_crawling_page = crwaling_start_page
+        indexed_count = 0 # 역색인에 넘긴 게시글 수
 
         while not stop_crawling and current_crawling_page <= last_page: # 마지막 페이지까지 크롤링
             print(f"\n정보: 종목 {stock_code} - 현재 크롤링 페이지: {current_crawling_page} / 총 {last_page} 페이지")
@@ -511,8 +517,9 @@ def scrape_stock_articles_by_date_range(stock_data, proxy=None):
                         'vote_start_date': stock_data['start_date'].date(),
                         'vote_end_date': stock_data['end_date'].date()
                     }
-                    all_articles_data.append(article_data)
-                    print(f"정보: 종목 {stock_code} - 게시글 '{article_data['article_title'][:20]}...' ({article_data['article_date']}) 크롤링 완료. (누적: {len(all_articles_data)}건)")
+                    if detector is None or detector.apply(article_data, canonical_records):
+                        all_articles_data.append(article_data)
+                        print(f"정보: 종목 {stock_code} - 게시글 '{article_data['article_title'][:20]}...' ({article_data['article_date']}) 크롤링 완료. (누적: {len(all_articles_data)}건)")
                     
                     page_move_by_list_button(driver, wait, stock_code, current_crawling_page, True)
                     
@@ -554,6 +561,9 @@ def scrape_stock_articles_by_date_range(stock_data, proxy=None):
             if stop_crawling:
                 break
             save_to_csv(all_articles_data, output_dir="output", filename=f"stock_articles_{election}_{candidate}_{stock_code}.csv")
+            if index_dir: # 페이지를 저장할 때마다 이번 페이지에서 새로 수집한 게시글만 역색인에 추가
+                update_corpus_index(index_dir, all_articles_data[indexed_count:])
+                indexed_count = len(all_articles_data)
             current_crawling_page += 1 # 다음 페이지로 이동
     except Exception as e:
         print(f"치명적 오류: 종목 {stock_code} 크롤링 중 예상치 못한 오류 발생:{e}")
@@ -584,7 +594,7 @@ def save_to_csv(data_list, output_dir="output", filename="crawled_articles.csv")
     # index=False는 DataFrame의 인덱스를 CSV에 포함하지 않도록 함
     #mode = 'a' if os.path.exists(file_path) else 'w'
     mode = "w"
-    header = not os.path.exists(file_path) # 파일이 없으면 헤더 포함
+    header = True # mode "w"는 누적된 전체 데이터를 다시 쓰므로 헤더를 항상 포함
 
     try:
         df.to_csv(file_path, mode=mode, header=header, index=False, encoding='utf-8-sig')
@@ -733,6 +743,14 @@ def main():
                         help="필터링할 문자열 (예: '20대 이재명 정책주'). 'election', 'candidate', 'category', 'stock_code' 컬럼에서 검색합니다.")
     parser.add_argument('-l', '--logic', type=str, default='or', choices=['or', 'and'],
                         help="필터링 키워드 간의 검색 조건 ('or' 또는 'and', 기본값: or)")
+    parser.add_argument('-d', '--dedup', type=str, default='off', choices=DEDUP_MODES,
+                        help="유사 중복/스팸 게시글 처리 모드 ('off', 'flag', 'skip', 'merge', 기본값: off)")
+    parser.add_argument('-t', '--dedup_threshold', type=float, default=SIMILARITY_THRESHOLD,
+                        help="중복 판단 유사도 임계값 (기본값: 0.8)")
+    parser.add_argument('--dedup_index_dir', type=str, default=None,
+                        help="종목별 중복 탐지 인덱스를 저장/복원할 디렉토리 (예: output/dedup_index)")
+    parser.add_argument('-i', '--index_dir', type=str, default=None,
+                        help="종목별 크롤링이 끝날 때마다 게시글을 증분 색인할 역색인 디렉토리 (예: output/index)")
     args = parser.parse_args()
    
     stock_list_to_crawl = load_theme_stock_list(args.file, args.option, args.logic)
@@ -747,6 +765,7 @@ def main():
     proxy_list = [None] # 프록시를 사용하지 않을 경우
 
     all_results = []
+    detector = NearDuplicateDetector(args.dedup, args.dedup_threshold, index_dir=args.dedup_index_dir) if args.dedup != 'off' else None
     
     # ThreadPoolExecutor를 사용하여 여러 종목을 동시에 크롤링 (병렬 처리)
     # max_workers는 동시에 실행될 스레드(작업자)의 수
@@ -756,7 +775,7 @@ def main():
         for i, stock_data in enumerate(stock_list_to_crawl):
             # 각 종목에 대해 랜덤으로 프록시 할당 (또는 None 할당)
             proxy_to_use = random.choice(proxy_list) 
-            futures.append(executor.submit(scrape_stock_articles_by_date_range, stock_data, proxy_to_use))
+            futures.append(executor.submit(scrape_stock_articles_by_date_range, stock_data, proxy_to_use, detector, args.index_dir))
 
         for future in futures:
             result = future.result()
@@ -764,6 +783,9 @@ def main():
                 all_results.extend(result)
 
     print("\n--- 모든 종목 크롤링 완료 ---")
+    if detector:
+        detector.save_report(OUTPUT_DIR)
+        detector.save_indexes()
     if all_results:
         # 모든 종목의 데이터를 하나의 CSV로 저장할 수도 있습니다.
         #save_to_csv(all_results, filename="all_stock_articles.csv")
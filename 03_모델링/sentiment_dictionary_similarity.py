@@ -0,0 +1,290 @@
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+# 전역 설정
+DICT_DIR = 'sentiment_dictionary'
+TOP_K = 5 # 유사 단어 상위 k개 (자기 자신 제외)
+BLOCK_SIZE = 2048 # 한 번에 유사도를 계산할 행(단어) 수
+SCORE_WEIGHT = 0.6 # 최종점수 = 점수 * 0.6 + 빈도정규화 * 0.2 + 유사도점수 * 0.2
+FREQ_WEIGHT = 0.2
+SIMILARITY_WEIGHT = 0.2
+OUTPUT_COLUMNS = ['단어', '빈도', '점수', '빈도정규화', '유사도점수', '최종점수']
+
+
+# --- 벡터화 ---
+def load_word_dictionary(file_path):
+    """'단어,빈도,점수' 형식의 감성 사전 CSV를 로드합니다."""
+    if not os.path.exists(file_path):
+        print(f"오류: 감성 사전 파일이 없습니다. '{file_path}' 경로를 확인해주세요.")
+        return pd.DataFrame(columns=['단어', '빈도', '점수'])
+    df = pd.read_csv(file_path, encoding='utf-8-sig')
+    df['단어'] = df['단어'].astype(str).str.strip()
+    return df
+
+
+def build_vocabulary(*dfs):
+    """여러 사전의 단어를 합쳐 정렬된 전체 어휘 목록을 만듭니다."""
+    words = set()
+    for df in dfs:
+        words.update(df['단어'].tolist())
+    return sorted(words)
+
+
+def build_char_ngram_matrix(words):
+    """
+    단어 목록을 char 2~3-gram TF-IDF 희소 행렬(CSR)로 변환합니다.
+    TfidfVectorizer의 기본 l2 정규화 덕분에 두 행의 내적이 곧 코사인 유사도입니다.
+    """
+    vectorizer = TfidfVectorizer(vocabulary=words, analyzer='char', ngram_range=(2, 3), dtype=np.float32)
+    return vectorizer.fit_transform(words).tocsr()
+
+
+# --- 상위 k개 이웃 탐색 ---
+def _topk_from_block(block_sim, row_offset, k):
+    """
+    블록 유사도(희소 행렬)에서 각 행의 상위 k개 이웃을 뽑습니다.
+    자기 자신과 유사도 0 이하인 항목은 제외하며, 모자란 자리는 인덱스 -1로 채웁니다.
+    """
+    block_sim = block_sim.tocsr()
+    n_rows = block_sim.shape[0]
+    rows = np.repeat(np.arange(n_rows), np.diff(block_sim.indptr))
+    cols = block_sim.indices
+    sims = block_sim.data
+
+    keep = (cols != rows + row_offset) & (sims > 0)
+    rows, cols, sims = rows[keep], cols[keep], sims[keep]
+
+    # 행 오름차순, 유사도 내림차순(동률이면 인덱스 오름차순)으로 정렬한 뒤 행별 순위가 k 미만인 항목만 남김
+    order = np.lexsort((cols, -sims, rows))
+    rows, cols, sims = rows[order], cols[order], sims[order]
+    row_start = np.searchsorted(rows, np.arange(n_rows))
+    rank = np.arange(len(rows)) - row_start[rows]
+    keep = rank < k
+
+    top_idx = np.full((n_rows, k), -1, dtype=np.int64)
+    top_sim = np.zeros((n_rows, k), dtype=np.float32)
+    top_idx[rows[keep], rank[keep]] = cols[keep]
+    top_sim[rows[keep], rank[keep]] = sims[keep]
+    return top_idx, top_sim
+
+
+def topk_similar_blocked(matrix, k=TOP_K, block_size=BLOCK_SIZE):
+    """
+    행 블록 단위로 희소 행렬 곱을 수행하여 단어별 상위 k개 이웃과 유사도를 계산합니다.
+    전체 유사도 행렬을 만들지 않으므로 메모리는 블록 하나의 결과 크기에 비례합니다.
+    """
+    n_words = matrix.shape[0]
+    top_idx = np.full((n_words, k), -1, dtype=np.int64)
+    top_sim = np.zeros((n_words, k), dtype=np.float32)
+    matrix_t = matrix.T.tocsc()
+
+    for start in range(0, n_words, block_size):
+        end = min(start + block_size, n_words)
+        block_sim = matrix[start:end] @ matrix_t
+        top_idx[start:end], top_sim[start:end] = _topk_from_block(block_sim, start, k)
+    return top_idx, top_sim
+
+
+def topk_similar_ann(matrix, k=TOP_K):
+    """
+    pynndescent 근사 최근접 이웃 인덱스로 단어별 상위 k개 이웃을 계산합니다.
+    어휘가 매우 커서 블록 계산도 부담스러울 때 사용합니다. (선택 의존성)
+    """
+    try:
+        from pynndescent import NNDescent
+    except ImportError:
+        raise ImportError("근사 최근접 이웃 탐색에는 pynndescent 패키지가 필요합니다. (pip install pynndescent)")
+
+    n_words = matrix.shape[0]
+    # n-gram이 하나도 없는 영벡터 단어는 pynndescent에서 서로 거리 0(유사도 1)이 되므로 색인에서 제외
+    # (블록 방식에서도 이 단어들은 이웃이 없음)
+    nonzero_rows = np.flatnonzero(matrix.getnnz(axis=1) > 0)
+    if len(nonzero_rows) < 2:
+        return np.full((n_words, k), -1, dtype=np.int64), np.zeros((n_words, k), dtype=np.float32)
+
+    index = NNDescent(matrix[nonzero_rows], metric='cosine', n_neighbors=min(k + 1, len(nonzero_rows)))
+    neighbor_idx, neighbor_dist = index.neighbor_graph
+    neighbor_sim = 1.0 - neighbor_dist.ravel()
+    cols = neighbor_idx.ravel()
+    rows = np.repeat(nonzero_rows, neighbor_idx.shape[1])
+    found = cols >= 0
+
+    block_sim = sparse.csr_matrix(
+        (neighbor_sim[found], (rows[found], nonzero_rows[cols[found]])), shape=(n_words, n_words)
+    )
+    return _topk_from_block(block_sim, 0, k)
+
+
+# --- 점수 계산 ---
+def similarity_score(df, all_words, top_idx, top_sim):
+    """
+    각 단어에 대해 상위 k개 유사 단어 중 같은 사전에 있는 단어들의 점수를 유사도로 가중 평균합니다.
+    유사도 합이 0에 가까우면 단순 평균, 유사 단어가 없으면 0을 반환합니다.
+    """
+    word2idx = pd.Series(np.arange(len(all_words)), index=all_words)
+    score_lookup = np.full(len(all_words), np.nan)
+    first_rows = df.drop_duplicates(subset='단어')
+    score_lookup[word2idx[first_rows['단어']].to_numpy()] = first_rows['점수'].to_numpy()
+
+    row_idx = word2idx.reindex(df['단어']).to_numpy()
+    found = ~np.isnan(row_idx)
+    neighbors = np.full((len(df), top_idx.shape[1]), -1, dtype=np.int64)
+    weights = np.zeros((len(df), top_idx.shape[1]), dtype=np.float64)
+    neighbors[found] = top_idx[row_idx[found].astype(np.int64)]
+    weights[found] = top_sim[row_idx[found].astype(np.int64)]
+
+    related_scores = np.where(neighbors >= 0, score_lookup[neighbors], np.nan)
+    valid = ~np.isnan(related_scores)
+    related_scores = np.where(valid, related_scores, 0.0)
+    weights = np.where(valid, weights, 0.0)
+
+    weight_sum = weights.sum(axis=1)
+    valid_count = valid.sum(axis=1)
+    weighted = (related_scores * weights).sum(axis=1) / np.where(weight_sum > 1e-6, weight_sum, 1.0)
+    mean = related_scores.sum(axis=1) / np.maximum(valid_count, 1)
+    return np.where(valid_count == 0, 0.0, np.where(weight_sum > 1e-6, weighted, mean))
+
+
+def normalize(series):
+    """빈도 정규화 함수 (0~1 스케일링)"""
+    return (series - series.min()) / (series.max() - series.min() + 1e-6)
+
+
+def build_final_dictionary(df, all_words, top_idx, top_sim):
+    """사전에 빈도정규화, 유사도점수, 최종점수 컬럼을 추가합니다."""
+    df = df.copy()
+    df['빈도정규화'] = normalize(df['빈도'])
+    df['유사도점수'] = similarity_score(df, all_words, top_idx, top_sim)
+    df['최종점수'] = (
+        df['점수'] * SCORE_WEIGHT +
+        df['빈도정규화'] * FREQ_WEIGHT +
+        df['유사도점수'] * SIMILARITY_WEIGHT
+    ).round(4)
+    return df[OUTPUT_COLUMNS]
+
+
+def compute_topk(all_words, k=TOP_K, block_size=BLOCK_SIZE, use_ann=False):
+    """어휘 전체에 대해 희소 벡터화 후 상위 k개 이웃을 계산합니다."""
+    matrix = build_char_ngram_matrix(all_words)
+    if use_ann:
+        return topk_similar_ann(matrix, k)
+    return topk_similar_blocked(matrix, k, block_size)
+
+
+def build_scored_dictionaries(dict_dir=DICT_DIR, output_dir=DICT_DIR, k=TOP_K, block_size=BLOCK_SIZE, use_ann=False):
+    """
+    긍정/부정 사전을 로드하여 유사도점수와 최종점수를 계산하고 final_*_dict.csv로 저장합니다.
+    """
+    df_positive = load_word_dictionary(os.path.join(dict_dir, 'positive_words_dict.csv'))
+    df_negative = load_word_dictionary(os.path.join(dict_dir, 'negative_words_dict.csv'))
+    all_words = build_vocabulary(df_positive, df_negative)
+    if not all_words:
+        print("경고: 유사도를 계산할 단어가 없습니다.")
+        return None, None
+    print(f"정보: 전체 어휘 {len(all_words)}개에 대해 상위 {k}개 유사 단어 계산 시작. (ANN: {'사용' if use_ann else '미사용'})")
+
+    top_idx, top_sim = compute_topk(all_words, k, block_size, use_ann)
+    final_positive = build_final_dictionary(df_positive, all_words, top_idx, top_sim)
+    final_negative = build_final_dictionary(df_negative, all_words, top_idx, top_sim)
+
+    os.makedirs(output_dir, exist_ok=True)
+    final_positive.to_csv(os.path.join(output_dir, 'final_positive_dict.csv'), index=False)
+    final_negative.to_csv(os.path.join(output_dir, 'final_negative_dict.csv'), index=False)
+    print(f"정보: 긍정 {len(final_positive)}개, 부정 {len(final_negative)}개 단어의 최종 사전을 '{output_dir}'에 저장했습니다.")
+    return final_positive, final_negative
+
+
+# --- 벤치마크 ---
+def generate_synthetic_vocabulary(base_words, size, seed=42):
+    """기존 사전 단어의 음절 분포를 따라 2~4음절 합성 단어를 size개 생성합니다."""
+    rng = random.Random(seed)
+    syllables = [ch for word in base_words for ch in word]
+    words = set(base_words[:size])
+    while len(words) < size:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _dense_topk(all_words, k=TOP_K):
+    """기존 노트북 방식: 전체 유사도 행렬을 밀집 배열로 만든 뒤 상위 k개를 정렬로 선택합니다."""
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    vectors = build_char_ngram_matrix(all_words).toarray()
+    similarity_matrix = cosine_similarity(vectors)
+    return np.argsort(similarity_matrix, axis=1)[:, ::-1][:, 1:k + 1]
+
+
+def _measure(func, *args, **kwargs):
+    """함수 실행 시간(초)과 최대 메모리 사용량(MB)을 측정합니다."""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def benchmark_similarity(sizes, dict_dir=DICT_DIR, k=TOP_K, block_size=BLOCK_SIZE, dense_limit=10000, use_ann=False):
+    """
+    어휘 크기별로 밀집 방식(기존)과 희소 블록 방식의 실행 시간과 최대 메모리를 비교합니다.
+    밀집 방식은 dense_limit 이하의 크기에서만 실행합니다.
+    """
+    df_positive = load_word_dictionary(os.path.join(dict_dir, 'positive_words_dict.csv'))
+    df_negative = load_word_dictionary(os.path.join(dict_dir, 'negative_words_dict.csv'))
+    base_words = build_vocabulary(df_positive, df_negative)
+
+    results = []
+    for size in sizes:
+        all_words = generate_synthetic_vocabulary(base_words, size)
+        row = {'어휘수': len(all_words)}
+        row['희소_시간(초)'], row['희소_메모리(MB)'] = _measure(compute_topk, all_words, k, block_size)
+        if use_ann:
+            row['ANN_시간(초)'], row['ANN_메모리(MB)'] = _measure(compute_topk, all_words, k, block_size, True)
+        if len(all_words) <= dense_limit:
+            row['밀집_시간(초)'], row['밀집_메모리(MB)'] = _measure(_dense_topk, all_words, k)
+        else:
+            row['밀집_시간(초)'], row['밀집_메모리(MB)'] = np.nan, np.nan
+        print(f"정보: 어휘 {len(all_words)}개 측정 완료.")
+        results.append(row)
+
+    df_result = pd.DataFrame(results)
+    print(df_result.to_string(index=False))
+    return df_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감성 사전 희소 top-k 유사도 점수 계산기")
+    parser.add_argument('-d', '--dict_dir', type=str, default=DICT_DIR,
+                        help="positive_words_dict.csv / negative_words_dict.csv가 있는 디렉토리 (기본값: sentiment_dictionary)")
+    parser.add_argument('-o', '--output_dir', type=str, default=DICT_DIR,
+                        help="final_*_dict.csv를 저장할 디렉토리 (기본값: sentiment_dictionary)")
+    parser.add_argument('-k', '--top_k', type=int, default=TOP_K,
+                        help="단어별 유사 단어 수 (기본값: 5)")
+    parser.add_argument('-b', '--block_size', type=int, default=BLOCK_SIZE,
+                        help="한 번에 유사도를 계산할 행 수 (기본값: 2048)")
+    parser.add_argument('--ann', action='store_true',
+                        help="pynndescent 근사 최근접 이웃 인덱스 사용")
+    parser.add_argument('--benchmark', type=int, nargs='*', default=None,
+                        help="어휘 크기별 벤치마크 실행 (예: --benchmark 5000 20000 100000)")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        sizes = args.benchmark or [5000, 10000, 20000, 50000, 100000]
+        benchmark_similarity(sizes, args.dict_dir, args.top_k, args.block_size, use_ann=args.ann)
+        return
+
+    build_scored_dictionaries(args.dict_dir, args.output_dir, args.top_k, args.block_size, args.ann)
+
+
+if __name__ == "__main__":
+    main()
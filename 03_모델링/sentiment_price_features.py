@@ -0,0 +1,333 @@
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# 전역 설정
+KEY_COLUMNS = ['stock_code', 'vote_election', 'vote_candidate'] # 피처를 계산하는 단위 (있는 컬럼만 사용)
+SCORE_COLUMN = 'integrated_sentiment_score'
+ENGAGEMENT_COLUMNS = ['article_viewers', 'article_likes', 'article_dislikes']
+WINDOWS = (3, 5, 10) # 이동 평균 기간 (거래일)
+LAGS = (1, 2, 3) # 시차 (거래일)
+PRICE_DIR = 'data/stock_price'
+
+
+# --- 데이터 로드 ---
+def load_price_data(price_dir=PRICE_DIR, stock_codes=None):
+    """
+    data/stock_price/{stock_code}.csv 주가 파일들을 하나의 DataFrame(stock_code, Date, Close[, Volume])으로 로드합니다.
+    """
+    if stock_codes is None:
+        stock_codes = [os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(price_dir, '*.csv'))]
+
+    frames = []
+    for stock_code in stock_codes:
+        file_path = os.path.join(price_dir, f'{stock_code}.csv')
+        if not os.path.exists(file_path):
+            print(f"경고: '{file_path}' 주가 파일을 찾을 수 없습니다.")
+            continue
+        df = pd.read_csv(file_path)
+        df['Date'] = pd.to_datetime(df['Date'])
+        df['stock_code'] = str(stock_code).zfill(6)
+        frames.append(df[['stock_code', 'Date', 'Close'] + (['Volume'] if 'Volume' in df.columns else [])])
+
+    if not frames:
+        return pd.DataFrame({'stock_code': pd.Series(dtype=str), 'Date': pd.Series(dtype='datetime64[ns]'), 'Close': pd.Series(dtype=float)})
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_scored_articles(file_pattern):
+    """integrated_sentiment_score 컬럼이 있는 게시글 CSV들을 하나의 DataFrame으로 로드합니다."""
+    frames = [pd.read_csv(p, dtype={'stock_code': str}, low_memory=False) for p in sorted(glob.glob(file_pattern))]
+    if not frames:
+        print(f"경고: '{file_pattern}'에 해당하는 파일이 없습니다.")
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+# --- 일별 집계 및 거래일 정렬 ---
+def aggregate_daily(articles, keys):
+    """(키, article_date) 단위로 감성 점수 합계/게시글 수/참여 지표 합계를 집계합니다."""
+    df = pd.DataFrame({key: articles[key].astype(str) for key in keys})
+    df['stock_code'] = df['stock_code'].str.zfill(6)
+    df['article_date'] = pd.to_datetime(articles['article_date']).dt.normalize()
+    df['sentiment_sum'] = pd.to_numeric(articles[SCORE_COLUMN], errors='coerce')
+    df['post_count'] = df['sentiment_sum'].notna().astype(np.int64)
+    df['sentiment_sum'] = df['sentiment_sum'].fillna(0.0)
+    for col in ENGAGEMENT_COLUMNS:
+        values = articles[col] if col in articles.columns else pd.Series(0, index=articles.index)
+        df[col] = pd.to_numeric(values, errors='coerce').fillna(0).astype(np.int64)
+
+    sum_columns = ['sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS
+    return df.groupby(keys + ['article_date'], sort=False)[sum_columns].sum().reset_index()
+
+
+def align_to_trading_days(daily, prices, keys):
+    """
+    게시일을 같은 날 또는 그 이후 첫 거래일로 옮겨(as-of forward join) 다시 집계합니다.
+    주말/휴일 게시글은 다음 거래일에 반영되며, 마지막 거래일 이후 게시글은 제외됩니다.
+    """
+    trading_days = prices[['stock_code', 'Date']].drop_duplicates().sort_values('Date')
+    daily = daily.sort_values('article_date')
+    aligned = pd.merge_asof(daily, trading_days, left_on='article_date', right_on='Date', by='stock_code', direction='forward')
+
+    dropped = aligned['Date'].isna().sum()
+    if dropped:
+        print(f"경고: 대응하는 거래일이 없는 일별 집계 {dropped}건을 제외합니다. (주가 데이터 기간을 확인해주세요)")
+    aligned = aligned.dropna(subset=['Date'])
+    sum_columns = ['sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS
+    return aligned.groupby(keys + ['Date'], sort=False)[sum_columns].sum().reset_index()
+
+
+def build_panel(aligned, prices, keys):
+    """
+    키별로 첫 게시 거래일부터 마지막 게시 거래일까지의 모든 거래일 행을 만들고 주가와 감성 집계를 붙입니다.
+    게시글이 없는 거래일은 post_count 0, 감성 점수 NaN이 됩니다.
+    """
+    ranges = aligned.groupby(keys, sort=False)['Date'].agg(['min', 'max']).reset_index()
+    panel = ranges.merge(prices, on='stock_code')
+    panel = panel[(panel['Date'] >= panel['min']) & (panel['Date'] <= panel['max'])].drop(columns=['min', 'max'])
+    panel = panel.merge(aligned, on=keys + ['Date'], how='left')
+
+    count_columns = ['sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS
+    panel[count_columns] = panel[count_columns].fillna(0)
+    panel[['post_count'] + ENGAGEMENT_COLUMNS] = panel[['post_count'] + ENGAGEMENT_COLUMNS].astype(np.int64)
+    return panel.sort_values(keys + ['Date'], kind='mergesort').reset_index(drop=True)
+
+
+# --- NumPy 그룹 연산 ---
+def _group_bounds(panel, keys):
+    """정렬된 패널에서 행별 그룹 시작/끝 위치 배열을 반환합니다."""
+    n_rows = len(panel)
+    if n_rows == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    key_values = panel[keys].to_numpy()
+    is_start = np.ones(n_rows, dtype=bool)
+    is_start[1:] = (key_values[1:] != key_values[:-1]).any(axis=1)
+    start_positions = np.flatnonzero(is_start)
+    end_positions = np.append(start_positions[1:], n_rows) - 1
+    sizes = np.diff(np.append(start_positions, n_rows))
+    return np.repeat(start_positions, sizes), np.repeat(end_positions, sizes)
+
+
+def grouped_shift(values, group_start, group_end, lag):
+    """그룹 경계를 넘지 않는 shift. lag > 0이면 과거 값, lag < 0이면 미래 값을 가져옵니다."""
+    values = np.asarray(values, dtype=np.float64)
+    source = np.arange(len(values)) - lag
+    valid = (source >= group_start) & (source <= group_end)
+    shifted = np.full(len(values), np.nan)
+    shifted[valid] = values[source[valid]]
+    return shifted
+
+
+def grouped_rolling_sum(values, group_start, window):
+    """
+    그룹 경계를 넘지 않는 누적합 기반 이동 합계. 기간이 다 차지 않았거나 기간 안에 NaN이 있는 행은 NaN입니다.
+    (NaN은 0으로 바꿔 누적하고 개수를 따로 누적하므로, NaN 하나가 이후 행/종목으로 번지지 않음)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    positions = np.arange(len(values))
+    is_nan = np.isnan(values)
+    cumsum = np.concatenate(([0.0], np.cumsum(np.where(is_nan, 0.0, values))))
+    nan_count = np.concatenate(([0], np.cumsum(is_nan)))
+    lower = np.maximum(positions - window + 1, group_start)
+    sums = cumsum[positions + 1] - cumsum[lower]
+    sums[(positions - lower + 1 < window) | (nan_count[positions + 1] - nan_count[lower] > 0)] = np.nan
+    return sums
+
+
+def add_rolling_features(panel, keys, windows=WINDOWS, lags=LAGS):
+    """감성 점수/게시글 수/종가의 이동 평균, 시차 값, 수익률을 전체 종목에 대해 한 번에 계산합니다."""
+    group_start, group_end = _group_bounds(panel, keys)
+    post_count = panel['post_count'].to_numpy(dtype=np.float64)
+    sentiment_sum = panel['sentiment_sum'].to_numpy(dtype=np.float64)
+    close = panel['Close'].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sentiment = np.where(post_count > 0, sentiment_sum / post_count, np.nan)
+        returns = close / grouped_shift(close, group_start, group_end, 1) - 1
+
+        features = {
+            SCORE_COLUMN: sentiment,
+            'return': returns,
+            'next_return': grouped_shift(returns, group_start, group_end, -1),
+        }
+        for window in windows:
+            window_posts = grouped_rolling_sum(post_count, group_start, window)
+            window_sentiment = grouped_rolling_sum(sentiment_sum, group_start, window)
+            features[f'sentiment_ma{window}'] = np.where(window_posts > 0, window_sentiment / window_posts, np.nan)
+            features[f'post_count_ma{window}'] = window_posts / window
+            features[f'close_ma{window}'] = grouped_rolling_sum(close, group_start, window) / window
+        for lag in lags:
+            features[f'sentiment_lag{lag}'] = grouped_shift(sentiment, group_start, group_end, lag)
+            features[f'post_count_lag{lag}'] = grouped_shift(post_count, group_start, group_end, lag)
+            features[f'return_lag{lag}'] = grouped_shift(returns, group_start, group_end, lag)
+
+    return pd.concat([panel, pd.DataFrame(features, index=panel.index)], axis=1)
+
+
+def build_feature_table(articles, prices, windows=WINDOWS, lags=LAGS, keys=None):
+    """
+    감성 점수가 매겨진 전체 게시글과 전체 주가로부터 (키, 거래일) 단위 피처 테이블을 만듭니다.
+    article_date(거래일), integrated_sentiment_score, Close 컬럼을 포함하므로
+    SentimentVisualizer.plot_sentiment_and_price_comparison에 종목별로 잘라 바로 넘길 수 있습니다.
+    """
+    keys = keys or [key for key in KEY_COLUMNS if key in articles.columns]
+    if prices.empty:
+        print("경고: 주가 데이터가 없어 빈 피처 테이블을 반환합니다. (주가 파일 경로를 확인해주세요)")
+        panel = pd.DataFrame(columns=keys + ['Date', 'Close', 'sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS)
+        return add_rolling_features(panel, keys, windows, lags).rename(columns={'Date': 'article_date'})
+
+    prices = prices.assign(stock_code=prices['stock_code'].astype(str).str.zfill(6))
+    daily = aggregate_daily(articles, keys)
+    aligned = align_to_trading_days(daily, prices, keys)
+    panel = build_panel(aligned, prices, keys)
+    features = add_rolling_features(panel, keys, windows, lags)
+    return features.rename(columns={'Date': 'article_date'})
+
+
+def save_feature_table(df, file_path):
+    """피처 테이블을 parquet(pyarrow/fastparquet 필요)으로 저장하고, 불가능하면 CSV로 저장합니다."""
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    if file_path.endswith('.parquet'):
+        try:
+            df.to_parquet(file_path, index=False)
+            print(f"정보: 피처 테이블 {len(df)}행을 '{file_path}'에 저장했습니다.")
+            return file_path
+        except ImportError:
+            file_path = file_path[:-len('.parquet')] + '.csv'
+            print("경고: parquet 엔진(pyarrow)이 없어 CSV로 저장합니다.")
+    df.to_csv(file_path, index=False, encoding='utf-8-sig')
+    print(f"정보: 피처 테이블 {len(df)}행을 '{file_path}'에 저장했습니다.")
+    return file_path
+
+
+# --- 벤치마크 ---
+def per_stock_loop_features(articles, prices, windows=WINDOWS, lags=LAGS, keys=None):
+    """
+    기존 분석 루프처럼 종목(키)별로 집계, 주가 병합, rolling/shift를 반복하는 기준 구현입니다.
+    build_feature_table과 같은 결과를 내며 벤치마크 비교용으로만 사용합니다.
+    """
+    keys = keys or [key for key in KEY_COLUMNS if key in articles.columns]
+    prices = prices.assign(stock_code=prices['stock_code'].astype(str).str.zfill(6))
+    articles = articles.assign(stock_code=articles['stock_code'].astype(str).str.zfill(6))
+    frames = []
+    for key_values, group in articles.groupby(keys, sort=False):
+        key_values = key_values if isinstance(key_values, tuple) else (key_values,)
+        price = prices[prices['stock_code'] == group['stock_code'].iloc[0]].sort_values('Date')
+        daily = aggregate_daily(group, keys)
+        aligned = align_to_trading_days(daily, price, keys)
+        if aligned.empty:
+            continue
+        df = price[(price['Date'] >= aligned['Date'].min()) & (price['Date'] <= aligned['Date'].max())]
+        df = df.merge(aligned.drop(columns=keys), on='Date', how='left')
+        for key, value in zip(keys, key_values):
+            df[key] = str(value)
+        df[['sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS] = df[['sentiment_sum', 'post_count'] + ENGAGEMENT_COLUMNS].fillna(0)
+
+        df[SCORE_COLUMN] = (df['sentiment_sum'] / df['post_count']).where(df['post_count'] > 0)
+        df['return'] = df['Close'] / df['Close'].shift(1) - 1
+        df['next_return'] = df['return'].shift(-1)
+        for window in windows:
+            window_posts = df['post_count'].rolling(window).sum()
+            df[f'sentiment_ma{window}'] = (df['sentiment_sum'].rolling(window).sum() / window_posts).where(window_posts > 0)
+            df[f'post_count_ma{window}'] = df['post_count'].rolling(window).mean()
+            df[f'close_ma{window}'] = df['Close'].rolling(window).mean()
+        for lag in lags:
+            df[f'sentiment_lag{lag}'] = df[SCORE_COLUMN].shift(lag)
+            df[f'post_count_lag{lag}'] = df['post_count'].shift(lag)
+            df[f'return_lag{lag}'] = df['return'].shift(lag)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True).rename(columns={'Date': 'article_date'})
+
+
+def generate_synthetic_corpus(n_stocks, n_days=120, posts_per_day=30, missing_close_ratio=0.01, seed=42):
+    """벤치마크용 합성 게시글/주가 데이터를 생성합니다. missing_close_ratio만큼의 종가는 NaN(거래정지 등)으로 둡니다."""
+    rng = np.random.RandomState(seed)
+    calendar = pd.date_range('2022-01-01', periods=n_days, freq='D')
+    trading_days = pd.date_range(calendar[0], periods=n_days + 7, freq='B') # 마지막 주말 게시글이 옮겨갈 거래일 포함
+    stock_codes = [f'{i:06d}' for i in range(n_stocks)]
+
+    prices = pd.DataFrame({
+        'stock_code': np.repeat(stock_codes, len(trading_days)),
+        'Date': np.tile(trading_days, n_stocks),
+        'Close': 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_stocks * len(trading_days)))),
+    })
+    prices.loc[rng.rand(len(prices)) < missing_close_ratio, 'Close'] = np.nan
+    n_posts = n_stocks * n_days * posts_per_day
+    articles = pd.DataFrame({
+        'stock_code': rng.choice(stock_codes, n_posts),
+        'article_date': rng.choice(calendar, n_posts),
+        SCORE_COLUMN: rng.uniform(-1, 1, n_posts),
+        'article_viewers': rng.randint(0, 5000, n_posts),
+        'article_likes': rng.randint(0, 50, n_posts),
+        'article_dislikes': rng.randint(0, 50, n_posts),
+    })
+    return articles, prices
+
+
+def benchmark_features(stock_counts=(10, 50, 200), n_days=120, posts_per_day=30):
+    """종목 수별로 종목별 루프 방식과 벡터화 파이프라인의 실행 시간을 비교하고 결과가 같은지 확인합니다."""
+    results = []
+    for n_stocks in stock_counts:
+        articles, prices = generate_synthetic_corpus(n_stocks, n_days, posts_per_day)
+
+        start_time = time.perf_counter()
+        loop_df = per_stock_loop_features(articles, prices)
+        loop_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        vector_df = build_feature_table(articles, prices)
+        vector_time = time.perf_counter() - start_time
+
+        sort_columns = ['stock_code', 'article_date']
+        loop_df = loop_df.sort_values(sort_columns).reset_index(drop=True)
+        vector_df = vector_df.sort_values(sort_columns).reset_index(drop=True)
+        numeric_columns = vector_df.select_dtypes(include='number').columns
+        same = np.allclose(loop_df[numeric_columns].to_numpy(dtype=float), vector_df[numeric_columns].to_numpy(dtype=float), equal_nan=True)
+
+        results.append({
+            '종목수': n_stocks,
+            '게시글수': len(articles),
+            '종목별루프(초)': round(loop_time, 3),
+            '벡터화(초)': round(vector_time, 3),
+            '속도향상(배)': round(loop_time / vector_time, 1),
+            '결과일치': same,
+        })
+        print(f"정보: 종목 {n_stocks}개 측정 완료.")
+
+    df_result = pd.DataFrame(results)
+    print(df_result.to_string(index=False))
+    return df_result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일별 감성 점수-주가 피처 테이블 생성기")
+    parser.add_argument('-a', '--articles', type=str, default='output_sentiment/scored/*.csv',
+                        help="integrated_sentiment_score가 포함된 게시글 CSV glob 패턴 (기본값: output_sentiment/scored/*.csv)")
+    parser.add_argument('-p', '--price_dir', type=str, default=PRICE_DIR,
+                        help="종목별 주가 CSV 디렉토리 (기본값: data/stock_price)")
+    parser.add_argument('-o', '--output', type=str, default='output_sentiment/sentiment_price_features.parquet',
+                        help="피처 테이블 저장 경로 (.parquet 또는 .csv)")
+    parser.add_argument('--benchmark', type=int, nargs='*', default=None,
+                        help="종목 수별 벤치마크 실행 (예: --benchmark 10 50 200)")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        benchmark_features(args.benchmark or (10, 50, 200))
+        return
+
+    articles = load_scored_articles(args.articles)
+    if articles.empty:
+        return
+    prices = load_price_data(args.price_dir, articles['stock_code'].astype(str).str.zfill(6).unique())
+    features = build_feature_table(articles, prices)
+    save_feature_table(features, args.output)
+
+
+if __name__ == "__main__":
+    main()